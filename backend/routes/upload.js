@@ -164,9 +164,11 @@ router.delete("/datasets/:id", verifyToken, async (req, res) => {
     if (!dataset) {
       return res.status(404).json({ error: "Dataset not found" });
     }
-    // Delete physical file
-    if (fs.existsSync(dataset.filePath)) {
-      fs.unlinkSync(dataset.filePath);
+    // Delete physical file (and the ML service's parsed-array cache beside it)
+    for (const file of [dataset.filePath, `${dataset.filePath}.f32.npy`]) {
+      if (fs.existsSync(file)) {
+        fs.unlinkSync(file);
+      }
     }
     // Delete associated result
     if (dataset.resultId) {
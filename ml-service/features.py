@@ -22,9 +22,10 @@ EEG Frequency Bands:
 """
 
 import numpy as np
+from functools import lru_cache
+from scipy import fft as scipy_fft
 from scipy import signal as scipy_signal
-from scipy.stats import skew, kurtosis
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple, Union
 
 # Frequency band definitions (Hz)
 BANDS = {
@@ -35,36 +36,174 @@ BANDS = {
     "gamma": (30.0, 50.0),
 }
 
+# Full analysis range used by spectral entropy / edge / peak features
+ANALYSIS_BAND = (0.5, 50.0)
+
+# scipy.fft worker threads for the PSD transform (-1 = all cores). Inference
+# pool workers set this to 1 so N processes don't each spawn N FFT threads.
+FFT_WORKERS = -1
+
+
+def _nperseg(n_samples: int, fs: float) -> int:
+    """Welch segment length: 2-second windows, capped by signal length."""
+    return max(min(int(2 * fs), n_samples), 4)
+
+
+def _slice(freqs: np.ndarray, fmin: float, fmax: float) -> slice:
+    """
+    Bins with fmin <= freq <= fmax as a slice. `freqs` is sorted, so two
+    binary searches replace a full boolean mask, and `psd[sl]` is a view.
+    """
+    lo = int(np.searchsorted(freqs, fmin, side="left"))
+    hi = int(np.searchsorted(freqs, fmax, side="right"))
+    return slice(lo, max(lo, hi))
+
+
+def _trapezoid_weights(freqs: np.ndarray, sl: slice) -> np.ndarray:
+    """
+    Full-length (freqs,) trapezoid weights for the bins in `sl`, zero
+    elsewhere, so `weights @ psd` equals `trapz(psd[sl], freqs[sl])`.
+    """
+    # Trapezoid rule: each interval contributes half its width to both ends
+    weights = np.zeros(len(freqs))
+    if sl.stop - sl.start > 1:
+        half_dx = 0.5 * np.diff(freqs[sl])
+        weights[sl.start:sl.stop - 1] += half_dx
+        weights[sl.start + 1:sl.stop] += half_dx
+    return weights
+
+
+@lru_cache(maxsize=8)
+def _band_indices(fs: float, nperseg: int) -> Dict[str, Tuple[slice, np.ndarray]]:
+    """
+    Frequency-bin lookup table for a given Welch configuration.
+
+    Welch frequencies depend only on (fs, nperseg), so the per-band bin
+    slices and trapezoid weights are computed once and reused by every
+    call. Maps band → (slice, weights) for each of BANDS plus "analysis"
+    (ANALYSIS_BAND). `weights` is a full-length (freqs,) vector that is
+    zero outside the band, so `weights @ psd` equals
+    `trapz(psd[sl], freqs[sl])`. Weights are read-only since they are shared.
+    """
+    freqs = np.fft.rfftfreq(nperseg, d=1.0 / fs)   # identical to welch's freqs
+    table = {}
+    for band, (fmin, fmax) in {**BANDS, "analysis": ANALYSIS_BAND}.items():
+        sl = _slice(freqs, fmin, fmax)
+        weights = _trapezoid_weights(freqs, sl)
+        weights.setflags(write=False)
+        table[band] = (sl, weights)
+    return table
+
+
+@lru_cache(maxsize=8)
+def _band_weight_matrix(fs: float, nperseg: int) -> np.ndarray:
+    """
+    Stacked trapezoid weights for all of BANDS, shape (5, freqs).
+
+    `_band_weight_matrix(...) @ psd` integrates every band in one matrix
+    product — (5,) for a 1D PSD, (5, channels) for a 2D PSD.
+    """
+    table = _band_indices(fs, nperseg)
+    matrix = np.stack([table[band][1] for band in BANDS])
+    matrix.setflags(write=False)
+    return matrix
+
 
 # ── Band Power Functions ──────────────────────────────────────────────────────
 
 def compute_band_power(psd: np.ndarray, freqs: np.ndarray,
                        fmin: float, fmax: float) -> float:
     """Compute average power in a frequency band via trapezoidal integration."""
-    idx = np.where((freqs >= fmin) & (freqs <= fmax))[0]
-    if len(idx) == 0:
+    sl = _slice(freqs, fmin, fmax)
+    if sl.stop == sl.start:
         return 0.0
-    return float(np.trapz(psd[idx], freqs[idx]))
+    return float(_band_power(psd, _trapezoid_weights(freqs, sl)))
+
+
+def _band_power(psd: np.ndarray, weights: np.ndarray):
+    """
+    `compute_band_power` for a Welch PSD, from the band's precomputed
+    trapezoid weight vector (see `_band_indices`) — one dot product. `psd`
+    may be 1D (freqs,) or 2D (freqs × channels); a 2D PSD yields one band
+    power per channel in one gemv.
+    """
+    return weights @ psd
+
+
+@lru_cache(maxsize=8)
+def _welch_window(fs: float, nperseg: int) -> Tuple[np.ndarray, float]:
+    """Periodic Hann window and its PSD density scale, 1 / (fs · Σw²)."""
+    window = scipy_signal.get_window("hann", nperseg)
+    window.setflags(write=False)
+    return window, 1.0 / (fs * float(np.sum(window * window)))
+
+
+def compute_psd(eeg_data: np.ndarray,
+                fs: float = 128.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Welch PSD along the time axis (axis 0).
+
+    Equivalent to scipy.signal.welch(window="hann", noverlap=nperseg//2,
+    detrend="constant", scaling="density", axis=0), but implemented as
+    strided frames + one batched scipy.fft.rfft using all worker threads.
+    A 2D (samples × channels) input is transformed in a single call,
+    returning `psd` of shape (freqs × channels).
+
+    The signal is processed in float32 (complex64 spectrum): EEG features
+    don't need double precision, and it halves memory traffic. Internally
+    the data is framed channel-major (channels × samples) so every FFT
+    frame is contiguous; callers keep the samples-first convention.
+    """
+    eeg_data = np.asarray(eeg_data, dtype=np.float32)
+    nperseg = _nperseg(eeg_data.shape[0], fs)
+    step    = nperseg - nperseg // 2
+    window, scale = _welch_window(fs, nperseg)
+
+    x = np.ascontiguousarray(eeg_data.T)
+    single_segment = x.shape[-1] == nperseg
+    if single_segment:
+        # Signal no longer than one segment (short /predict/signal payloads):
+        # one windowed rfft of the whole signal, no framing / segment mean
+        frames = x - x.mean(axis=-1, keepdims=True)
+    else:
+        # ([channels,] segments, nperseg) view over a channel-major copy — each
+        # frame is contiguous along time, so pocketfft doesn't copy per channel
+        frames = np.lib.stride_tricks.sliding_window_view(x, nperseg, axis=-1)[..., ::step, :]
+        frames = frames - frames.mean(axis=-1, keepdims=True)
+    spec   = scipy_fft.rfft(frames * window.astype(np.float32), axis=-1, workers=FFT_WORKERS)
+
+    psd = (spec.real ** 2 + spec.imag ** 2) * scale
+    # One-sided spectrum: double everything except DC (and Nyquist if even)
+    if nperseg % 2:
+        psd[..., 1:] *= 2.0
+    else:
+        psd[..., 1:-1] *= 2.0
+    if not single_segment:
+        psd = psd.mean(axis=-2)                 # mean over segments
+    psd = np.moveaxis(psd, -1, 0)               # → (freqs, ...)
+
+    freqs = scipy_fft.rfftfreq(nperseg, d=1.0 / fs)
+    return freqs, psd
 
 
 def extract_band_powers(eeg_signal: np.ndarray,
-                        fs: float = 128.0) -> Dict[str, float]:
+                        fs: float = 128.0,
+                        psd: Optional[np.ndarray] = None) -> Dict[str, float]:
     """
     Extract absolute per-band power from 1D EEG signal using Welch's method.
     Returns dict of band → power (μV²/Hz).
-    """
-    n_samples = len(eeg_signal)
-    nperseg = min(int(2 * fs), n_samples)
-    nperseg = max(nperseg, 4)
 
-    freqs, psd = scipy_signal.welch(
-        eeg_signal, fs=fs, window="hann",
-        nperseg=nperseg, noverlap=nperseg // 2, scaling="density",
-    )
+    Pass `psd` (from `compute_psd(eeg_signal, fs)`) to reuse an
+    already-computed spectrum instead of running Welch again.
+    """
+    eeg_signal = np.asarray(eeg_signal, dtype=np.float32)
+    if psd is None:
+        _, psd = compute_psd(eeg_signal, fs)
+    table = _band_indices(fs, _nperseg(len(eeg_signal), fs))
 
     return {
-        band: round(compute_band_power(psd, freqs, fmin, fmax), 6)
-        for band, (fmin, fmax) in BANDS.items()
+        band: float(_band_power(psd, table[band][1]))
+        for band in BANDS
     }
 
 
@@ -80,8 +219,8 @@ def compute_relative_band_powers(band_powers: Dict[str, float]) -> Dict[str, flo
     total = sum(band_powers.values())
     if total < 1e-10:
         n = len(band_powers)
-        return {k: round(1.0 / n, 6) for k in band_powers}
-    return {k: round(v / total, 6) for k, v in band_powers.items()}
+        return {k: 1.0 / n for k in band_powers}
+    return {k: v / total for k, v in band_powers.items()}
 
 
 # ── Band Power Ratios ─────────────────────────────────────────────────────────
@@ -96,9 +235,9 @@ def compute_ratios(band_powers: Dict[str, float]) -> Dict[str, float]:
     theta = band_powers.get("theta", 1e-6)
     eps   = 1e-9
     return {
-        "alpha_beta_ratio":  round(alpha / (beta  + eps), 4),
-        "theta_alpha_ratio": round(theta / (alpha + eps), 4),
-        "fatigue_index":     round((alpha + theta) / (beta + eps), 4),
+        "alpha_beta_ratio":  alpha / (beta  + eps),
+        "theta_alpha_ratio": theta / (alpha + eps),
+        "fatigue_index":     (alpha + theta) / (beta + eps),
     }
 
 
@@ -120,7 +259,7 @@ def _ratio_features(rel_band_powers: Dict[str, float]) -> Tuple[float, float, fl
 
 # ── Hjorth Parameters ─────────────────────────────────────────────────────────
 
-def compute_hjorth_parameters(signal: np.ndarray) -> Tuple[float, float, float]:
+def compute_hjorth_parameters(signal: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Compute Hjorth parameters — classic time-domain EEG descriptors.
 
@@ -130,28 +269,39 @@ def compute_hjorth_parameters(signal: np.ndarray) -> Tuple[float, float, float]:
 
     Reference: Hjorth (1970), "EEG analysis based on time domain properties"
 
+    Accepts a 1D signal or a 2D (samples × channels) array; statistics are
+    taken along axis 0, giving per-channel values for 2D input.
+
     Returns:
-        (activity, mobility, complexity) — all normalized to [0, 1] range
+        (activity, mobility, complexity) — all normalized to [0, 1] range;
+        NumPy scalars for 1D input, (channels,) arrays for 2D input
     """
     eps = 1e-10
-    signal = np.asarray(signal, dtype=float)
+    signal = np.asarray(signal)
+
+    # One variance pass per derivative order; each is reused below rather
+    # than recomputing std() of the same buffer
+    dx  = np.diff(signal, axis=0)
+    ddx = np.diff(dx, axis=0)
+    var_x   = np.var(signal, axis=0)
+    std_x   = np.sqrt(var_x)
+    std_dx  = np.sqrt(np.var(dx,  axis=0))
+    std_ddx = np.sqrt(np.var(ddx, axis=0))
 
     # Activity
-    activity = float(np.var(signal))
+    activity = var_x
 
     # First derivative
-    dx = np.diff(signal)
-    mobility = float(np.std(dx) / (np.std(signal) + eps))
+    mobility = std_dx / (std_x + eps)
 
     # Second derivative
-    ddx = np.diff(dx)
-    mobility_dx = float(np.std(ddx) / (np.std(dx) + eps))
-    complexity = float(mobility_dx / (mobility + eps))
+    mobility_dx = std_ddx / (std_dx + eps)
+    complexity = mobility_dx / (mobility + eps)
 
     # Soft-clip to reasonable range to avoid extreme outliers
-    activity   = float(np.log1p(activity))      # log-scale for variance
-    mobility   = float(np.clip(mobility,   0.0, 10.0))
-    complexity = float(np.clip(complexity, 0.0, 10.0))
+    activity   = np.log1p(activity)             # log-scale for variance
+    mobility   = np.clip(mobility,   0.0, 10.0)
+    complexity = np.clip(complexity, 0.0, 10.0)
 
     return activity, mobility, complexity
 
@@ -159,7 +309,9 @@ def compute_hjorth_parameters(signal: np.ndarray) -> Tuple[float, float, float]:
 # ── Spectral Entropy ──────────────────────────────────────────────────────────
 
 def compute_spectral_entropy(psd: np.ndarray, freqs: np.ndarray,
-                             fmin: float = 0.5, fmax: float = 50.0) -> float:
+                             fmin: float = 0.5, fmax: float = 50.0,
+                             band_slice: Optional[slice] = None,
+                             total_power: Optional[np.ndarray] = None) -> Union[float, np.ndarray]:
     """
     Compute spectral entropy of the EEG power spectrum in [fmin, fmax].
 
@@ -167,26 +319,58 @@ def compute_spectral_entropy(psd: np.ndarray, freqs: np.ndarray,
     Low entropy  → power concentrated in few bands (e.g. strong alpha in Calm)
     High entropy → power spread across many frequencies (e.g. Stress/Angry)
 
+    `psd` may be 1D or 2D (freqs × channels); entropy is computed per column.
+    Pass the precomputed `band_slice` for [fmin, fmax] to skip the lookup,
+    and `total_power` (psd[band_slice].sum(axis=0)) to skip the re-sum.
+
+    Returns a float for a 1D `psd`, or a (channels,) array for a 2D one.
+
     Reference: Inouye et al. (1991), "Quantification of EEG irregularity"
     """
-    idx = np.where((freqs >= fmin) & (freqs <= fmax))[0]
-    if len(idx) < 2:
-        return 0.0
-    psd_band = psd[idx]
-    total = psd_band.sum()
-    if total < 1e-10:
-        return 0.0
-    p = psd_band / total                   # normalise to probability dist
-    p = p[p > 1e-12]                       # avoid log(0)
-    entropy = float(-np.sum(p * np.log2(p)))
+    sl = band_slice if band_slice is not None else _slice(freqs, fmin, fmax)
+    n_bins = sl.stop - sl.start
+    if n_bins < 2:
+        return np.zeros(psd.shape[1:]) if psd.ndim > 1 else 0.0
+    psd_band = psd[sl]
+    total = psd_band.sum(axis=0) if total_power is None else total_power
+    flat  = total < 1e-10
+    p = psd_band / np.where(flat, 1.0, total)       # normalise to probability dist
+    # Bins with p ≤ 1e-12 contribute 0 (log2(1) = 0) — avoids log(0)
+    p_log_p = p * np.log2(np.where(p > 1e-12, p, 1.0))
+    entropy = -p_log_p.sum(axis=0)
     # Normalise by max possible entropy (uniform dist over N bins)
-    max_entropy = np.log2(len(idx))
-    return round(entropy / max_entropy if max_entropy > 0 else 0.0, 6)
+    max_entropy = np.log2(n_bins)
+    entropy = np.where(flat, 0.0, entropy / max_entropy)
+    return entropy if psd.ndim > 1 else float(entropy)
 
 
 # ── Statistical Features ──────────────────────────────────────────────────────
 
-def compute_statistical_features(signal: np.ndarray) -> Tuple[float, float]:
+def _skew_kurt(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Skewness and excess kurtosis along axis 0 from one set of central
+    moments (m2, m3, m4).
+
+    Same biased estimators as scipy.stats.skew / kurtosis(fisher=True),
+    without their input-validation / nan_policy wrappers — on a few
+    thousand samples per channel that overhead outweighs the arithmetic.
+    A constant signal (m2 = 0) scores 0 for both.
+    """
+    d  = x - np.mean(x, axis=0)
+    d2 = d * d
+    m2 = np.mean(d2, axis=0)
+    m3 = np.mean(d2 * d, axis=0)
+    m4 = np.mean(d2 * d2, axis=0)
+
+    flat = m2 <= 0.0
+    m2   = np.where(flat, 1.0, m2)
+    sk   = np.where(flat, 0.0, m3 / m2 ** 1.5)
+    kur  = np.where(flat, 0.0, m4 / (m2 * m2) - 3.0)
+    return sk, kur
+
+
+def compute_statistical_features(signal: np.ndarray
+                                 ) -> Tuple[Union[float, np.ndarray], Union[float, np.ndarray]]:
     """
     Compute skewness and excess kurtosis of the EEG signal amplitude.
 
@@ -195,9 +379,17 @@ def compute_statistical_features(signal: np.ndarray) -> Tuple[float, float]:
 
     These capture signal morphology differences between emotional states
     that pure frequency-domain methods miss.
+
+    Accepts a 1D signal or a 2D (samples × channels) array; statistics are
+    taken along axis 0. Returns (skewness, kurtosis) as floats for 1D input,
+    (channels,) arrays for 2D input.
     """
-    sk  = float(np.clip(skew(signal),              -5.0, 5.0))
-    kur = float(np.clip(kurtosis(signal, fisher=True), -5.0, 10.0))
+    sk, kur = _skew_kurt(np.asarray(signal))
+
+    sk  = np.clip(sk,  -5.0, 5.0)
+    kur = np.clip(kur, -5.0, 10.0)
+    if sk.ndim == 0:
+        return float(sk), float(kur)
     return sk, kur
 
 
@@ -205,7 +397,10 @@ def compute_statistical_features(signal: np.ndarray) -> Tuple[float, float]:
 
 def compute_spectral_edge_and_peak(psd: np.ndarray, freqs: np.ndarray,
                                    fmin: float = 0.5, fmax: float = 50.0,
-                                   edge_pct: float = 0.95) -> Tuple[float, float]:
+                                   edge_pct: float = 0.95,
+                                   band_slice: Optional[slice] = None,
+                                   total_power: Optional[np.ndarray] = None
+                                   ) -> Tuple[Union[float, np.ndarray], Union[float, np.ndarray]]:
     """
     Compute spectral edge frequency (SEF95) and dominant (peak) frequency.
 
@@ -214,34 +409,49 @@ def compute_spectral_edge_and_peak(psd: np.ndarray, freqs: np.ndarray,
                   High SEF95 → beta/gamma dominant (Stress/Angry)
     Peak freq   → frequency with maximum power density.
 
-    Returns both normalised to [0, 1] using the analysis bandwidth.
+    `psd` may be 1D or 2D (freqs × channels); values are computed per column.
+    Pass the precomputed `band_slice` for [fmin, fmax] to skip the lookup,
+    and `total_power` (psd[band_slice].sum(axis=0)) to skip the re-sum.
+
+    Returns both normalised to [0, 1] using the analysis bandwidth: floats
+    for a 1D `psd`, (channels,) arrays for a 2D one.
     """
-    idx = np.where((freqs >= fmin) & (freqs <= fmax))[0]
-    if len(idx) < 2:
+    sl = band_slice if band_slice is not None else _slice(freqs, fmin, fmax)
+    if sl.stop - sl.start < 2:
+        if psd.ndim > 1:
+            return np.full(psd.shape[1:], 0.5), np.full(psd.shape[1:], 0.5)
         return 0.5, 0.5
 
-    psd_band  = psd[idx]
-    freq_band = freqs[idx]
-    total     = psd_band.sum()
+    psd_band  = psd[sl]
+    freq_band = freqs[sl]
+    total     = psd_band.sum(axis=0) if total_power is None else total_power
+    flat      = total < 1e-10
 
-    # SEF95
-    if total < 1e-10:
-        sef = freq_band[len(freq_band) // 2]
-    else:
-        cumsum = np.cumsum(psd_band) / total
-        sef_idx = np.searchsorted(cumsum, edge_pct)
-        sef_idx = min(sef_idx, len(freq_band) - 1)
-        sef = float(freq_band[sef_idx])
+    # SEF95 — first bin whose cumulative fraction reaches edge_pct
+    # (count of bins strictly below it == searchsorted(..., side="left"))
+    cumsum  = np.cumsum(psd_band, axis=0) / np.where(flat, 1.0, total)
+    sef_idx = np.minimum((cumsum < edge_pct).sum(axis=0), len(freq_band) - 1)
+    sef = np.where(flat, freq_band[len(freq_band) // 2], freq_band[sef_idx])
 
     # Peak frequency
-    peak = float(freq_band[np.argmax(psd_band)])
+    peak = freq_band[np.argmax(psd_band, axis=0)]
 
     bw = fmax - fmin
-    return round((sef - fmin)  / bw, 6), round((peak - fmin) / bw, 6)
+    sef_norm  = (sef  - fmin) / bw
+    peak_norm = (peak - fmin) / bw
+    if psd.ndim > 1:
+        return sef_norm, peak_norm
+    return float(sef_norm), float(peak_norm)
 
 
 # ── Frontal Alpha Asymmetry ──────────────────────────────────────────────────
 
+def _alpha_power(psd: np.ndarray, fs: float, nperseg: int) -> np.ndarray:
+    """Alpha power per PSD column (cached trapezoid weights), floored at 1e-10 for the log."""
+    sl, weights = _band_indices(fs, nperseg)["alpha"]
+    return np.maximum(weights[sl] @ psd[sl], 1e-10)
+
+
 def compute_alpha_asymmetry(eeg_data: np.ndarray, fs: float = 128.0) -> float:
     """
     Compute Frontal Alpha Asymmetry (FAA) index.
@@ -265,6 +475,9 @@ def compute_alpha_asymmetry(eeg_data: np.ndarray, fs: float = 128.0) -> float:
     For single-channel EEG:
       - Returns 0.0 (cannot compute asymmetry)
 
+    All channels share one batched Welch call; feature extraction reuses
+    its own PSD through `_alpha_asymmetry` instead.
+
     Args:
         eeg_data: Preprocessed EEG, shape (samples,) or (samples × channels)
         fs: Sampling frequency in Hz
@@ -272,30 +485,81 @@ def compute_alpha_asymmetry(eeg_data: np.ndarray, fs: float = 128.0) -> float:
     Returns:
         FAA index as a float, clipped to [-3.0, 3.0]
     """
+    eeg_data = np.asarray(eeg_data, dtype=np.float32)
     if eeg_data.ndim == 1 or eeg_data.shape[1] < 2:
         return 0.0  # Cannot compute with one channel
+    _, psd = compute_psd(eeg_data, fs)
+    return _alpha_asymmetry(psd, fs, _nperseg(eeg_data.shape[0], fs))
 
-    n_channels = eeg_data.shape[1]
-    mid = n_channels // 2
-    left_channels  = range(0,   mid)          # first half = left hemisphere
-    right_channels = range(mid, n_channels)   # second half = right hemisphere
 
-    eps = 1e-10
+def _alpha_asymmetry(psd_multi: np.ndarray, fs: float, nperseg: int) -> float:
+    """
+    `compute_alpha_asymmetry` from an already-computed (freqs × channels)
+    Welch PSD, so FAA costs one alpha-band integral per channel and no
+    extra FFTs.
+    """
+    if psd_multi.ndim == 1 or psd_multi.shape[1] < 2:
+        return 0.0
 
-    def mean_alpha(ch_indices):
-        powers = []
-        for ch in ch_indices:
-            bp = extract_band_powers(eeg_data[:, ch], fs)
-            powers.append(max(bp.get("alpha", eps), eps))
-        return float(np.mean(powers))
+    n_channels = psd_multi.shape[1]
+    mid = n_channels // 2                    # first half = left hemisphere
 
-    alpha_left  = mean_alpha(left_channels)
-    alpha_right = mean_alpha(right_channels)
+    alpha = _alpha_power(psd_multi, fs, nperseg)
+
+    alpha_left  = float(np.mean(alpha[:mid]))
+    alpha_right = float(np.mean(alpha[mid:]))
 
     faa = np.log(alpha_right) - np.log(alpha_left)
     return float(np.clip(faa, -3.0, 3.0))
 
 
+def _features_from_psd(eeg_data: np.ndarray, freqs: np.ndarray,
+                       psd: np.ndarray, fs: float,
+                       out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Build the 16 base features from a signal and its Welch PSD.
+
+    Works column-wise: a 1D signal yields shape (16,), a 2D
+    (samples × channels) signal with (freqs × channels) PSD yields
+    shape (16, channels). Results are written straight into one
+    preallocated output (`out`, allocated here if not given) instead of
+    concatenating per-group lists.
+    """
+    nperseg = _nperseg(eeg_data.shape[0], fs)
+    an_sl   = _band_indices(fs, nperseg)["analysis"][0]
+    if out is None:
+        out = np.empty((16,) + psd.shape[1:], dtype=np.float32)
+
+    # 1. Relative band powers (5) — all bands integrated in one matmul
+    abs_bp = _band_weight_matrix(fs, nperseg) @ psd     # (5,) or (5, channels)
+    total  = abs_bp.sum(axis=0)
+    flat   = total < 1e-10
+    out[0:5] = np.where(flat, 1.0 / len(BANDS), abs_bp / np.where(flat, 1.0, total))
+    rel_bp = dict(zip(BANDS, out[0:5]))                 # [delta%, theta%, alpha%, beta%, gamma%]
+
+    # 2. Band-power ratios (3)
+    out[5:8] = _ratio_features(rel_bp)                  # [α/β, θ/α, (α+θ)/β]
+
+    # 3. Hjorth parameters (3)
+    out[8:11] = compute_hjorth_parameters(eeg_data)     # [activity, mobility, complexity]
+
+    # Analysis-band power, shared by the entropy and spectral-edge features
+    an_total = psd[an_sl].sum(axis=0)
+
+    # 4. Spectral entropy (1)
+    out[11] = compute_spectral_entropy(psd, freqs, *ANALYSIS_BAND,
+                                       band_slice=an_sl, total_power=an_total)
+
+    # 5. Statistical (2)
+    out[12:14] = compute_statistical_features(eeg_data)
+
+    # 6. Spectral edge + peak (2)
+    out[14:16] = compute_spectral_edge_and_peak(psd, freqs, *ANALYSIS_BAND,
+                                                band_slice=an_sl, total_power=an_total)
+
+    # Safety: replace any NaN/Inf with 0
+    return np.nan_to_num(out, nan=0.0, posinf=0.0, neginf=0.0, copy=False)
+
 
 def extract_enhanced_feature_vector(signal_1d: np.ndarray,
                                     fs: float = 128.0) -> np.ndarray:
@@ -318,53 +582,28 @@ def extract_enhanced_feature_vector(signal_1d: np.ndarray,
         fs: Sampling frequency in Hz
 
     Returns:
-        numpy array of shape (16,)
+        numpy array of shape (16,), float32
     """
-    n_samples = len(signal_1d)
-    nperseg = max(min(int(2 * fs), n_samples), 4)
-
-    freqs, psd = scipy_signal.welch(
-        signal_1d, fs=fs, window="hann",
-        nperseg=nperseg, noverlap=nperseg // 2, scaling="density",
-    )
-
-    # 1. Relative band powers (5)
-    abs_bp  = {b: compute_band_power(psd, freqs, fmin, fmax)
-               for b, (fmin, fmax) in BANDS.items()}
-    rel_bp  = compute_relative_band_powers(abs_bp)
-    f1 = list(rel_bp.values())                     # [delta%, theta%, alpha%, beta%, gamma%]
-
-    # 2. Band-power ratios (3)
-    f2 = list(_ratio_features(rel_bp))             # [α/β, θ/α, (α+θ)/β]
-
-    # 3. Hjorth parameters (3)
-    f3 = list(compute_hjorth_parameters(signal_1d))  # [activity, mobility, complexity]
-
-    # 4. Spectral entropy (1)
-    f4 = [compute_spectral_entropy(psd, freqs)]
-
-    # 5. Statistical (2)
-    f5 = list(compute_statistical_features(signal_1d))
-
-    # 6. Spectral edge + peak (2)
-    f6 = list(compute_spectral_edge_and_peak(psd, freqs))
-
-    feature_vec = np.array(f1 + f2 + f3 + f4 + f5 + f6, dtype=float)
-
-    # Safety: replace any NaN/Inf with 0
-    feature_vec = np.nan_to_num(feature_vec, nan=0.0, posinf=0.0, neginf=0.0)
-
-    return feature_vec
+    signal_1d  = np.asarray(signal_1d, dtype=np.float32)
+    freqs, psd = compute_psd(signal_1d, fs)
+    return _features_from_psd(signal_1d, freqs, psd, fs)
 
 
 def extract_features_from_multichannel(eeg_data: np.ndarray,
-                                       fs: float = 128.0) -> np.ndarray:
+                                       fs: float = 128.0,
+                                       freqs: Optional[np.ndarray] = None,
+                                       psd: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Extract enhanced 17-dim feature vector from multi-channel EEG.
 
     For single-channel: 16 base features + FAA=0.0 → shape (17,)
     For multi-channel:  mean of 16-dim vectors across channels + FAA → shape (17,)
 
+    All channels share one batched Welch call (axis=0); the resulting
+    (freqs × channels) PSD feeds both the per-channel features and FAA.
+    Callers that already hold `compute_psd(eeg_data, fs)` can pass
+    `freqs` / `psd` to skip it.
+
     Feature layout:
       [0-4]   Relative band powers (delta%, theta%, alpha%, beta%, gamma%)
       [5-7]   Band power ratios (alpha/beta, theta/alpha, fatigue)
@@ -377,21 +616,64 @@ def extract_features_from_multichannel(eeg_data: np.ndarray,
     Args:
         eeg_data: 2D (samples × channels) or 1D EEG signal
         fs: Sampling frequency
+        freqs, psd: Optional precomputed Welch PSD of `eeg_data`
 
     Returns:
-        Feature vector of shape (17,)
+        Feature vector of shape (17,), float32
     """
-    # Compute FAA from raw multi-channel data (before averaging)
-    faa = compute_alpha_asymmetry(eeg_data, fs)
+    eeg_data = np.asarray(eeg_data, dtype=np.float32)
+    if psd is None:
+        freqs, psd = compute_psd(eeg_data, fs)
+
+    feature_vec = np.empty(17, dtype=np.float32)   # [16 base features | FAA]
 
     if eeg_data.ndim == 1:
-        base = extract_enhanced_feature_vector(eeg_data, fs)
+        _features_from_psd(eeg_data, freqs, psd, fs, out=feature_vec[:16])
+        feature_vec[16] = 0.0
+    else:
+        channel_features = _features_from_psd(eeg_data, freqs, psd, fs)  # (16, channels)
+        np.mean(channel_features, axis=1, out=feature_vec[:16])
+        # FAA from the same multi-channel PSD (before averaging)
+        feature_vec[16] = _alpha_asymmetry(psd, fs, _nperseg(eeg_data.shape[0], fs))
+
+    return np.nan_to_num(feature_vec, nan=0.0, posinf=0.0, neginf=0.0, copy=False)
+
+
+def extract_features_from_batch(eeg_batch: np.ndarray,
+                                fs: float = 128.0) -> np.ndarray:
+    """
+    17-dim feature vectors for a batch of equal-length recordings.
+
+    `eeg_batch` is (samples × recordings × channels); row i of the result
+    matches `extract_features_from_multichannel(eeg_batch[:, i, :], fs)` to
+    float32 rounding (reductions run in a different order).
+    Every channel of every recording is a column of one Welch call and
+    one `_features_from_psd` pass, so the whole batch costs a single
+    batched FFT instead of one per recording.
+
+    Args:
+        eeg_batch: 3D (samples × recordings × channels) EEG array
+        fs: Sampling frequency
+
+    Returns:
+        Feature matrix of shape (recordings, 17), float32
+    """
+    eeg_batch = np.asarray(eeg_batch, dtype=np.float32)
+    n_samples, n_recordings, n_channels = eeg_batch.shape
+    columns = eeg_batch.reshape(n_samples, n_recordings * n_channels)
+    freqs, psd = compute_psd(columns, fs)
+
+    features = np.empty((n_recordings, 17), dtype=np.float32)   # [16 base features | FAA]
+    base = _features_from_psd(columns, freqs, psd, fs)           # (16, recordings·channels)
+    np.mean(base.reshape(16, n_recordings, n_channels), axis=2, out=features[:, :16].T)
+
+    if n_channels < 2:
+        features[:, 16] = 0.0
     else:
-        channel_features = [
-            extract_enhanced_feature_vector(eeg_data[:, ch], fs)
-            for ch in range(eeg_data.shape[1])
-        ]
-        base = np.mean(channel_features, axis=0)  # shape: (16,)
-
-    feature_vec = np.append(base, faa)             # shape: (17,)
-    return np.nan_to_num(feature_vec, nan=0.0, posinf=0.0, neginf=0.0)
+        # Same FAA as compute_alpha_asymmetry, per recording
+        alpha = _alpha_power(psd, fs, _nperseg(n_samples, fs)).reshape(n_recordings, n_channels)
+        mid = n_channels // 2
+        faa = np.log(alpha[:, mid:].mean(axis=1)) - np.log(alpha[:, :mid].mean(axis=1))
+        features[:, 16] = np.clip(faa, -3.0, 3.0)
+
+    return np.nan_to_num(features, nan=0.0, posinf=0.0, neginf=0.0, copy=False)
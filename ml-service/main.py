@@ -9,19 +9,181 @@ Endpoints:
     POST /predict/signal  → Predict from raw signal array (JSON)
 """
 
+import csv
 import time
 import random
 import os
-import csv
+import logging
+import struct
+import sys
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import get_context, resource_tracker, shared_memory
 import numpy as np
+import pandas as pd
+import scipy.fft
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from threadpoolctl import threadpool_limits
 from typing import Optional, List, Dict, Any
 
+# Configured before the local imports below so model-loading messages are kept
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"),
+                    format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+log = logging.getLogger("emoharmony.ml")
+
+import features as _features
 from preprocessing import preprocess_eeg
-from features import extract_band_powers, extract_features_from_multichannel, compute_ratios, compute_relative_band_powers
-from model_engine import predict_emotion
+from features import compute_psd, extract_band_powers, extract_features_from_multichannel, compute_ratios, compute_relative_band_powers
+from model_engine import predict_emotion, use_single_thread
+
+# ─── FFT Backend ──────────────────────────────────────────────────────────────
+
+# Name prefix of the shared-memory block holding exported FFTW wisdom, so
+# that workers started after the first one import plans instead of
+# re-planning. The full name is scoped to one server (see _wisdom_block_name).
+FFTW_WISDOM_SHM = "emoharmony_fftw_wisdom"
+
+
+def _configure_fft_backend():
+    """
+    Route scipy.fft (and therefore the Welch PSD in features.py) through
+    pyFFTW when it is installed. The interface cache keeps the FFTW plan for
+    the fixed nperseg=256 transform alive across requests, so planning is
+    paid once. Without pyFFTW, SciPy's bundled pocketfft is used unchanged.
+
+    Returns the pyfftw module, or None if it is not installed.
+    """
+    try:
+        import pyfftw
+        from pyfftw.interfaces import scipy_fft as fftw_scipy_fft
+    except ImportError:
+        return None
+    scipy.fft.set_global_backend(fftw_scipy_fft)
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time(60)
+    log.info("scipy.fft backend: pyFFTW")
+    return pyfftw
+
+
+_PYFFTW = _configure_fft_backend()
+_WISDOM_BLOCK = None   # keeps the published shared-memory block alive
+
+
+def _wisdom_block_name() -> str:
+    """
+    Wisdom block name for this server: uvicorn/gunicorn workers share their
+    master's PID as parent, so siblings find each other's block while other
+    servers (and their stale blocks) use a different name.
+    """
+    return f"{FFTW_WISDOM_SHM}_{os.getppid()}"
+
+
+# Block layout: u64 payload length (written last, so 0 means "still being
+# written"), u32 count, then each wisdom string as u64 length + raw bytes.
+# Plain bytes rather than pickle: attaching to a block must never run code.
+_WISDOM_LEN = struct.Struct("<Q")
+_WISDOM_COUNT = struct.Struct("<I")
+
+
+def _encode_wisdom(wisdom) -> bytes:
+    """pyfftw.export_wisdom()'s tuple of bytes as count + length-prefixed strings."""
+    parts = [_WISDOM_COUNT.pack(len(wisdom))]
+    for item in wisdom:
+        parts += [_WISDOM_LEN.pack(len(item)), bytes(item)]
+    return b"".join(parts)
+
+
+def _decode_wisdom(buf) -> Optional[tuple]:
+    """Inverse of _encode_wisdom over a published block; None if incomplete or malformed."""
+    try:
+        (size,) = _WISDOM_LEN.unpack_from(buf, 0)
+        payload = bytes(buf[_WISDOM_LEN.size:_WISDOM_LEN.size + size])
+        if size == 0 or len(payload) != size:
+            return None
+        (count,) = _WISDOM_COUNT.unpack_from(payload, 0)
+        pos, wisdom = _WISDOM_COUNT.size, []
+        for _ in range(count):
+            (n,) = _WISDOM_LEN.unpack_from(payload, pos)
+            pos += _WISDOM_LEN.size
+            if pos + n > size:
+                return None
+            wisdom.append(payload[pos:pos + n])
+            pos += n
+    except struct.error:
+        return None
+    return tuple(wisdom)
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing block without taking ownership of it. Before
+    Python 3.13 attaching also registers the block with the resource
+    tracker, which then unlinks it when this process (tree) exits — so
+    registration is skipped for the attach.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _import_shared_wisdom(name: str) -> bool:
+    """
+    Import FFTW wisdom published by another process, if any.
+    Returns True if a published block was found (even if still being
+    written — the caller should not publish a second one). A block that
+    can't be attached or read is ignored and plans are made locally.
+    """
+    try:
+        block = _attach_block(name)
+    except (OSError, ValueError):
+        return False
+    try:
+        wisdom = _decode_wisdom(block.buf)
+        if wisdom is not None:
+            _PYFFTW.import_wisdom(wisdom)
+    finally:
+        block.close()
+    return True
+
+# ─── Inference Workers ────────────────────────────────────────────────────────
+
+# CPU-bound pipeline work (CSV parsing, filtering, PSD, model inference) runs
+# in a pool of worker processes so concurrent requests scale across cores
+# instead of contending for the GIL. Workers are spawned, not forked: the
+# parent already holds live threads (FFT / ensemble pools) that a fork would
+# copy in a broken state. Each worker imports this module, which loads the
+# models once per process. Each worker keeps its own FFT / BLAS / OpenMP /
+# ensemble work to one thread, so the pool size is the service's total CPU
+# footprint. It defaults to the core count capped at 4 (each worker holds a
+# full copy of the models) and can be set with INFERENCE_WORKERS. A pool of
+# one uses the event loop's default thread pool instead.
+INFERENCE_WORKERS = max(1, int(os.getenv("INFERENCE_WORKERS", min(4, os.cpu_count() or 1))))
+_INFERENCE_POOL: Optional[ProcessPoolExecutor] = None
+_THREAD_LIMITS = None   # keeps the worker's threadpoolctl limits in force
+
+
+def _worker_init(wisdom_name: str):
+    """
+    Inference worker start-up: reuse FFTW plans published by the parent
+    (under the parent's block name, passed in), then warm the pipeline so
+    the worker's first request is not a cold one. Inner parallelism is
+    pinned to one thread — the pool already provides one process per core.
+    """
+    global _THREAD_LIMITS
+    _features.FFT_WORKERS = 1
+    use_single_thread()
+    _THREAD_LIMITS = threadpool_limits(limits=1)
+    if _PYFFTW is not None:
+        _import_shared_wisdom(wisdom_name)
+    _warmup()
 
 # ─── App Setup ────────────────────────────────────────────────────────────────
 
@@ -53,71 +215,181 @@ class SignalRequest(BaseModel):
     modelType: Optional[str] = "SVM"
     channels: Optional[int] = 1
 
+class PredictionResponse(BaseModel):
+    """
+    Declaring the response model lets FastAPI validate and serialise the
+    result straight to JSON bytes in pydantic-core, instead of walking the
+    nested dicts with jsonable_encoder + json.dumps. Endpoints use
+    response_model_exclude_unset, so only the keys a route fills are sent.
+    """
+    emotion: str
+    confidence: float
+    emotionScores: Dict[str, float]
+    interpretation: str
+    modelUsed: str
+    bandPowers: Dict[str, float]
+    relativeBandPowers: Dict[str, float]
+    ratios: Dict[str, float]
+    processingTime: Optional[float] = None
+    samplesAnalyzed: Optional[int] = None
+    channelsAnalyzed: Optional[int] = None
+    fileName: Optional[str] = None
+
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
 SAMPLING_RATE = 128.0  # Hz (default for consumer EEG)
 
 
+@lru_cache(maxsize=8)
+def _pink_filter(n_samples: int) -> np.ndarray:
+    """1/sqrt(f) amplitude shaping for an rfft of length n_samples, as a column."""
+    pink_freqs = scipy.fft.rfftfreq(n_samples, d=1.0 / SAMPLING_RATE)
+    pink_freqs[0] = 1.0
+    inv_sqrt = (1.0 / np.sqrt(pink_freqs)).astype(np.float32)[:, None]
+    inv_sqrt.flags.writeable = False
+    return inv_sqrt
+
+
 def generate_synthetic_eeg(n_samples: int = 1280, n_channels: int = 14) -> np.ndarray:
     """
     Generate realistic synthetic EEG signal for demo/fallback purposes.
     Uses overlapping multi-component sinusoids per band + 1/f pink noise,
     matching the signal generation used during model training.
+
+    Fully vectorised: every (band, component, channel) sinusoid is drawn
+    and evaluated in one broadcast, and the pink noise for all channels
+    comes from one batched, multi-threaded scipy.fft rfft/irfft pair.
     """
-    t = np.linspace(0, n_samples / SAMPLING_RATE, n_samples)
-    data = np.zeros((n_samples, n_channels))
-    band_ranges = [
+    rng = np.random.default_rng()
+    t = np.linspace(0, n_samples / SAMPLING_RATE, n_samples, dtype=np.float32)
+    band_ranges = np.array([
         (1.0, 3.0,  2.0, 8.0),   # delta: freq range, amp range
         (5.0, 7.0,  1.5, 5.0),   # theta
         (9.0, 12.0, 3.0, 10.0),  # alpha
         (15.0, 25.0, 1.0, 4.0),  # beta
         (35.0, 45.0, 0.5, 2.0),  # gamma
-    ]
-    for ch in range(n_channels):
-        ch_signal = np.zeros(n_samples)
-        for f_low, f_high, a_low, a_high in band_ranges:
-            n_components = np.random.randint(2, 5)
-            for _ in range(n_components):
-                amp   = np.random.uniform(a_low, a_high) / n_components
-                freq  = np.random.uniform(f_low, f_high)
-                phase = np.random.uniform(0, 2 * np.pi)
-                ch_signal += amp * np.sin(2 * np.pi * freq * t + phase)
-        # 1/f pink noise
-        white = np.random.randn(n_samples)
-        fft   = np.fft.rfft(white)
-        freqs = np.fft.rfftfreq(n_samples, d=1.0 / SAMPLING_RATE)
-        freqs[0] = 1.0
-        pink = np.fft.irfft(fft / np.sqrt(freqs), n=n_samples)
-        ch_signal += pink / (np.std(pink) + 1e-10) * 0.3
-        data[:, ch] = ch_signal
-    return data
+    ])
+    f_low, f_high, a_low, a_high = band_ranges.T[:, :, None, None]   # each (bands, 1, 1)
+
+    # 2-4 components per (band, channel): draw the max, zero unused slots
+    max_components = 4
+    shape = (len(band_ranges), max_components, n_channels)
+    n_components = rng.integers(2, max_components + 1, size=(len(band_ranges), 1, n_channels))
+    active = np.arange(max_components)[None, :, None] < n_components
+    amps   = rng.uniform(a_low, a_high, size=shape) / n_components * active
+    freqs  = rng.uniform(f_low, f_high, size=shape)
+    phases = rng.uniform(0, 2 * np.pi, size=shape)
+
+    # (samples, band·component, channels) → sum over components
+    amps, freqs, phases = (a.reshape(-1, n_channels).astype(np.float32)
+                           for a in (amps, freqs, phases))
+    data = (amps * np.sin(2 * np.pi * freqs * t[:, None, None] + phases)).sum(axis=1)
+
+    # 1/f pink noise — generated at a 5-smooth FFT length and trimmed, which
+    # is statistically identical and keeps odd request sizes off slow paths
+    n_fft = scipy.fft.next_fast_len(n_samples, real=True)
+    white = rng.standard_normal((n_fft, n_channels), dtype=np.float32)
+    fft   = scipy.fft.rfft(white, axis=0, workers=_features.FFT_WORKERS)
+    pink  = scipy.fft.irfft(fft * _pink_filter(n_fft), n=n_fft, axis=0, workers=_features.FFT_WORKERS)[:n_samples]
+    data += pink / (np.std(pink, axis=0, keepdims=True) + 1e-10) * 0.3
+    return data.astype(np.float32)
+
+
+def _has_header(file_path: str) -> bool:
+    """True if the first row of the file contains a non-numeric field."""
+    with open(file_path, "r", encoding="utf-8", errors="ignore", newline="") as f:
+        first_row = next(csv.reader(f), [])
+    for token in first_row:
+        token = token.strip()
+        if not token:
+            continue
+        try:
+            float(token)
+        except ValueError:
+            return True
+    return False
+
+
+# Parsed CSVs are cached beside the original as a float32 .npy, so repeated
+# analyses of the same upload (retries, model comparisons) skip parsing.
+# Only files inside the backend's uploads directory are cached — the backend
+# deletes `<upload>.f32.npy` with the upload — so a client-supplied filePath
+# elsewhere never gets files written next to it.
+CSV_CACHE_SUFFIX = ".f32.npy"
+UPLOADS_DIR = os.path.realpath(os.getenv(
+    "UPLOADS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend", "uploads")))
+
+
+def _csv_cache_path(file_path: str) -> Optional[str]:
+    """Cache file for `file_path`, or None if it lies outside UPLOADS_DIR."""
+    real_path = os.path.realpath(file_path)
+    if os.path.commonpath([real_path, UPLOADS_DIR]) != UPLOADS_DIR:
+        log.info("Not caching %s: outside the uploads directory %s", file_path, UPLOADS_DIR)
+        return None
+    return real_path + CSV_CACHE_SUFFIX
+
+
+def _save_csv_cache(cache_path: str, arr: np.ndarray) -> None:
+    """Write the parsed-array cache atomically; skip (with a warning) if not writable."""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp.npy"
+    try:
+        np.save(tmp_path, arr)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        log.warning("Could not write CSV cache %s: %s", cache_path, e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 
 def load_eeg_from_csv(file_path: str) -> np.ndarray:
     """
     Load EEG data from CSV file. Assumes rows = samples, cols = channels.
-    Skips header row if present. Returns numpy array.
+    Skips header row if present. Returns float32 numpy array.
+
+    Parsing runs in pandas' C engine instead of a per-cell Python loop.
+    Rows containing non-numeric values are dropped, as are empty columns
+    (e.g. from trailing commas).
+
+    For files inside UPLOADS_DIR the parsed array is cached as
+    `<file_path>.f32.npy`; while that cache is newer than the CSV it is
+    memory-mapped instead of re-parsing. The map is
+    copy-on-write ("c"), not read-only: it never touches the file, and a
+    writeable array reuses the fused preprocessing kernel compiled in
+    _warmup instead of specialising it again for a read-only input.
     """
+    cache_path = _csv_cache_path(file_path)
     try:
-        data = []
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            reader = csv.reader(f)
-            for row in reader:
-                try:
-                    numeric = [float(x) for x in row if x.strip()]
-                    if numeric:
-                        data.append(numeric)
-                except ValueError:
-                    continue  # skip header or non-numeric rows
-        if len(data) < 10:
+        if cache_path and os.path.getmtime(cache_path) >= os.path.getmtime(file_path):
+            return np.load(cache_path, mmap_mode="c")
+    except (OSError, ValueError):
+        pass  # no cache yet, stale or unreadable — parse the CSV
+    try:
+        read_kwargs = dict(
+            header=None, skiprows=1 if _has_header(file_path) else 0,
+            engine="c", on_bad_lines="skip", encoding_errors="ignore",
+        )
+        try:
+            df = pd.read_csv(file_path, dtype=np.float32, **read_kwargs)
+        except ValueError:
+            # Stray non-numeric cells: coerce them to NaN so the row is dropped
+            df = pd.read_csv(file_path, **read_kwargs).apply(pd.to_numeric, errors="coerce")
+        df = df.dropna(axis=1, how="all").dropna(axis=0, how="any")
+        if len(df) < 10:
             return None
-        arr = np.array(data)
+        arr = df.to_numpy(dtype=np.float32)
+        if cache_path:
+            _save_csv_cache(cache_path, arr)
         return arr
     except Exception as e:
-        print(f"CSV load error: {e}")
+        log.warning("CSV load error: %s", e)
         return None
 
 
+def _round_dict(d: Dict[str, float], n: int = 4) -> Dict[str, float]:
+    """Round dict values for the JSON response (features stay unrounded)."""
+    return {k: round(float(v), n) for k, v in d.items()}
+
+
 def run_eeg_pipeline(eeg_data: np.ndarray, model_type: str) -> Dict[str, Any]:
     """
     Full EEG analysis pipeline:
@@ -133,30 +405,130 @@ def run_eeg_pipeline(eeg_data: np.ndarray, model_type: str) -> Dict[str, Any]:
     preprocessed = preprocess_eeg(eeg_data, fs=SAMPLING_RATE)
 
     # Step 2: Extract absolute band powers (mean across channels, for UI display)
+    # One batched Welch PSD covers every channel plus the channel mean, and
+    # is shared by the band-power display and the feature vector below.
     if preprocessed.ndim == 2:
         signal_1d = np.mean(preprocessed, axis=1)
+        freqs, psd = compute_psd(np.column_stack([preprocessed, signal_1d]), fs=SAMPLING_RATE)
+        psd_multi, psd_mean = psd[:, :-1], psd[:, -1]
     else:
         signal_1d = preprocessed
+        freqs, psd_multi = compute_psd(preprocessed, fs=SAMPLING_RATE)
+        psd_mean = psd_multi
 
-    abs_band_powers = extract_band_powers(signal_1d, fs=SAMPLING_RATE)
+    abs_band_powers = extract_band_powers(signal_1d, fs=SAMPLING_RATE, psd=psd_mean)
     ratios = compute_ratios(abs_band_powers)
 
     # Step 3: Relative band powers (scale-invariant) → used for ML prediction
     rel_band_powers = compute_relative_band_powers(abs_band_powers)
 
     # Step 4: Feature vector
-    features = extract_features_from_multichannel(preprocessed, fs=SAMPLING_RATE)
+    features = extract_features_from_multichannel(preprocessed, fs=SAMPLING_RATE,
+                                                  freqs=freqs, psd=psd_multi)
 
     # Step 5: Predict emotion using relative (scale-invariant) band powers
     result = predict_emotion(features, rel_band_powers, model_type=model_type)
 
     # Return absolute band powers for display, relative ones in a separate key
-    result["bandPowers"] = abs_band_powers
-    result["relativeBandPowers"] = rel_band_powers
-    result["ratios"] = ratios
+    result["bandPowers"] = _round_dict(abs_band_powers, 6)
+    result["relativeBandPowers"] = _round_dict(rel_band_powers, 6)
+    result["ratios"] = _round_dict(ratios)
 
     return result
 
+# ─── Startup ──────────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=None)
+def _warmup() -> None:
+    """
+    Run one synthetic 14-channel prediction through every trained model
+    path (once per process), so lazily-built state — FFT plans, the cached
+    Welch window / band tables, model predict paths — is ready before the
+    first real request.
+    """
+    eeg_data = generate_synthetic_eeg(n_samples=1280, n_channels=14)
+    for model_type in ("AUTO", "CNN"):   # AUTO covers SVM + XGB + LGBM
+        run_eeg_pipeline(eeg_data, model_type=model_type)
+
+
+@app.on_event("startup")
+def share_fft_wisdom():
+    """
+    Share FFTW plans across uvicorn/gunicorn workers.
+
+    The first worker to start runs one synthetic prediction to populate
+    FFTW wisdom, then publishes `pyfftw.export_wisdom()` in a SharedMemory
+    block named for this server. Later workers import that wisdom instead
+    of planning from scratch. The publisher unlinks the block on shutdown.
+    No-op when pyFFTW is not installed.
+    """
+    global _WISDOM_BLOCK
+    name = _wisdom_block_name()
+    if _PYFFTW is None or _import_shared_wisdom(name):
+        return
+
+    _warmup()
+    payload = _encode_wisdom(_PYFFTW.export_wisdom())
+    try:
+        block = shared_memory.SharedMemory(name=name, create=True,
+                                           size=_WISDOM_LEN.size + len(payload))
+    except FileExistsError:
+        return  # another worker published first
+    except OSError as e:
+        log.warning("FFTW wisdom not shared: %s", e)
+        return
+    block.buf[_WISDOM_LEN.size:_WISDOM_LEN.size + len(payload)] = payload
+    _WISDOM_LEN.pack_into(block.buf, 0, len(payload))   # marks the block complete
+    _WISDOM_BLOCK = block
+
+
+@app.on_event("shutdown")
+def release_fft_wisdom():
+    """Remove the published wisdom block, so it doesn't outlive the server in /dev/shm."""
+    global _WISDOM_BLOCK
+    if _WISDOM_BLOCK is None:
+        return
+    _WISDOM_BLOCK.close()
+    try:
+        _WISDOM_BLOCK.unlink()
+    except FileNotFoundError:
+        pass
+    _WISDOM_BLOCK = None
+
+
+@app.on_event("startup")
+def start_inference_pool():
+    """
+    Start the inference worker processes (after FFTW wisdom is published).
+
+    Spawned workers are otherwise started lazily, one per submitted job;
+    submitting one no-op per worker starts (and warms) them all now rather
+    than on the first requests. Without a pool the app process serves
+    requests itself, so it is warmed instead.
+    """
+    global _INFERENCE_POOL
+    if INFERENCE_WORKERS > 1:
+        _INFERENCE_POOL = ProcessPoolExecutor(max_workers=INFERENCE_WORKERS,
+                                              mp_context=get_context("spawn"),
+                                              initializer=_worker_init,
+                                              initargs=(_wisdom_block_name(),))
+        for _ in range(INFERENCE_WORKERS):
+            _INFERENCE_POOL.submit(int)
+    else:
+        _warmup()
+
+
+@app.on_event("shutdown")
+def stop_inference_pool():
+    if _INFERENCE_POOL is not None:
+        _INFERENCE_POOL.shutdown(cancel_futures=True)
+
+
+async def _run_in_worker(fn, *args):
+    """Run a CPU-bound job on the inference pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_INFERENCE_POOL, fn, *args)
+
 # ─── Endpoints ────────────────────────────────────────────────────────────────
 
 @app.get("/health")
@@ -218,41 +590,53 @@ def list_models():
     }
 
 
-@app.post("/predict")
-def predict(req: PredictRequest):
+def _predict_file_job(file_path: Optional[str], file_size: Optional[int],
+                      model_type: str) -> Dict[str, Any]:
     """
-    Main prediction endpoint.
-    Accepts file path from disk or generates synthetic EEG for demo.
-    Runs full preprocessing → feature extraction → model prediction pipeline.
+    /predict work unit, run on an inference worker: load the EEG file (or
+    synthesise a signal) inside the worker so only the path crosses the
+    process boundary, then run the full pipeline.
     """
-    start_time = time.time()
-
     # Load EEG data
     eeg_data = None
-    if req.filePath and os.path.exists(req.filePath):
-        ext = os.path.splitext(req.filePath)[1].lower()
+    if file_path and os.path.exists(file_path):
+        ext = os.path.splitext(file_path)[1].lower()
         if ext == ".csv" or ext == ".txt":
-            eeg_data = load_eeg_from_csv(req.filePath)
+            eeg_data = load_eeg_from_csv(file_path)
 
     # Fallback: generate synthetic EEG
     if eeg_data is None:
-        n_samples = max(512, min(req.fileSize // 10, 10000)) if req.fileSize else 1280
+        n_samples = max(512, min(file_size // 10, 10000)) if file_size else 1280
         eeg_data = generate_synthetic_eeg(n_samples=n_samples, n_channels=14)
 
     # Run pipeline
-    result = run_eeg_pipeline(eeg_data, model_type=req.modelType or "SVM")
+    result = run_eeg_pipeline(eeg_data, model_type=model_type)
+    result["samplesAnalyzed"] = eeg_data.shape[0]
+    result["channelsAnalyzed"] = eeg_data.shape[1] if eeg_data.ndim == 2 else 1
+    return result
+
+
+@app.post("/predict", response_model=PredictionResponse, response_model_exclude_unset=True)
+async def predict(req: PredictRequest):
+    """
+    Main prediction endpoint.
+    Accepts file path from disk or generates synthetic EEG for demo.
+    Runs full preprocessing → feature extraction → model prediction pipeline.
+    """
+    start_time = time.time()
+
+    result = await _run_in_worker(_predict_file_job, req.filePath, req.fileSize,
+                                  req.modelType or "SVM")
 
     # Add processing metadata
     result["processingTime"] = round((time.time() - start_time) * 1000, 1)
-    result["samplesAnalyzed"] = eeg_data.shape[0]
-    result["channelsAnalyzed"] = eeg_data.shape[1] if eeg_data.ndim == 2 else 1
     result["fileName"] = req.fileName
 
     return result
 
 
-@app.post("/predict/signal")
-def predict_from_signal(req: SignalRequest):
+@app.post("/predict/signal", response_model=PredictionResponse, response_model_exclude_unset=True)
+async def predict_from_signal(req: SignalRequest):
     """
     Direct signal prediction endpoint.
     Accepts raw EEG signal values as a JSON array.
@@ -261,6 +645,6 @@ def predict_from_signal(req: SignalRequest):
     if len(req.signal) < 64:
         raise HTTPException(status_code=400, detail="Signal too short (minimum 64 samples)")
 
-    eeg_data = np.array(req.signal)
-    result = run_eeg_pipeline(eeg_data, model_type=req.modelType or "SVM")
+    eeg_data = np.asarray(req.signal, dtype=np.float32)
+    result = await _run_in_worker(run_eeg_pipeline, eeg_data, req.modelType or "SVM")
     return result
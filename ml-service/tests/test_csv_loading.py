@@ -0,0 +1,51 @@
+"""
+CSV loading in main: header detection and row counts.
+
+Every data row must survive loading whether or not the file has a header
+line and whether or not its values are quoted.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+N_ROWS, N_CHANNELS = 50, 4
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).standard_normal((N_ROWS, N_CHANNELS)).astype(np.float32)
+
+
+def _write(path, values, header=False, quoted=False):
+    fmt = '"{:.4f}"' if quoted else "{:.4f}"
+    lines = [",".join(f"ch{i}" for i in range(N_CHANNELS))] if header else []
+    lines += [",".join(fmt.format(v) for v in row) for row in values]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+@pytest.mark.parametrize("quoted", [False, True])
+def test_no_header_keeps_every_row(tmp_path, values, quoted):
+    path = _write(tmp_path / "eeg.csv", values, quoted=quoted)
+
+    assert not main._has_header(path)
+    arr = main.load_eeg_from_csv(path)
+    assert arr.shape == (N_ROWS, N_CHANNELS)
+    np.testing.assert_allclose(arr, values, atol=1e-4)
+
+
+@pytest.mark.parametrize("quoted", [False, True])
+def test_header_row_is_skipped(tmp_path, values, quoted):
+    path = _write(tmp_path / "eeg.csv", values, header=True, quoted=quoted)
+
+    assert main._has_header(path)
+    arr = main.load_eeg_from_csv(path)
+    assert arr.shape == (N_ROWS, N_CHANNELS)
+    np.testing.assert_allclose(arr, values, atol=1e-4)
@@ -0,0 +1,77 @@
+"""
+features: the custom Welch PSD against scipy.signal.welch, and the batched
+feature path against the per-recording one.
+
+compute_psd works in float32, so it is compared to a float64 welch at a
+tolerance relative to the spectrum's peak. The batched features reduce
+float32 columns in a different order from the per-recording ones, so they
+agree to float32 rounding (~1e-5 relative), not bit for bit.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+from scipy import signal as scipy_signal
+from scipy.integrate import trapezoid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import features  # noqa: E402
+
+FS = 128.0
+
+
+def _welch(x: np.ndarray):
+    nperseg = features._nperseg(x.shape[0], FS)
+    return scipy_signal.welch(x.astype(np.float64), fs=FS, window="hann", nperseg=nperseg,
+                              noverlap=nperseg // 2, detrend="constant",
+                              scaling="density", axis=0)
+
+
+@pytest.mark.parametrize("shape", [
+    (1280,),       # 1D, several segments
+    (1280, 14),    # 2D, channels batched in one FFT
+    (200,),        # shorter than 2 s: a single segment (fast path)
+    (200, 3),      # single segment, 2D
+    (1001, 4),     # odd length
+    (255,),        # odd-length single segment (odd nperseg)
+])
+def test_compute_psd_matches_welch(shape):
+    rng = np.random.default_rng(0)
+    t = np.arange(shape[0]) / FS
+    x = rng.standard_normal(shape) * 10
+    x += (30 * np.sin(2 * np.pi * 10 * t) + 5)[(slice(None),) + (None,) * (len(shape) - 1)]
+
+    freqs, psd = features.compute_psd(x, FS)
+    ref_freqs, ref_psd = _welch(x)
+
+    np.testing.assert_allclose(freqs, ref_freqs)
+    assert psd.shape == ref_psd.shape
+    np.testing.assert_allclose(psd, ref_psd, rtol=1e-4, atol=1e-5 * np.abs(ref_psd).max())
+
+
+@pytest.mark.parametrize("n_channels", [1, 2, 5])
+def test_batch_features_match_per_recording(n_channels):
+    batch = np.random.default_rng(1).standard_normal((1280, 6, n_channels)).astype(np.float32) * 20
+
+    rows = features.extract_features_from_batch(batch, FS)
+
+    assert rows.shape == (6, 17)
+    for i in range(batch.shape[1]):
+        recording = batch[:, i, :] if n_channels > 1 else batch[:, i, 0]
+        expected = features.extract_features_from_multichannel(recording, FS)
+        np.testing.assert_allclose(rows[i], expected, rtol=1e-4, atol=1e-5)
+
+
+@pytest.mark.parametrize("band", list(features.BANDS))
+def test_compute_band_power_matches_trapezoid(band):
+    x = np.random.default_rng(2).standard_normal(1280) * 10
+    freqs, psd = features.compute_psd(x, FS)
+    fmin, fmax = features.BANDS[band]
+    mask = (freqs >= fmin) & (freqs <= fmax)
+
+    expected = trapezoid(psd[mask], freqs[mask])
+    assert features.compute_band_power(psd, freqs, fmin, fmax) == pytest.approx(expected, rel=1e-6)
+    assert features.compute_band_power(psd, freqs, 200.0, 300.0) == 0.0
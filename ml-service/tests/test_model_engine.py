@@ -0,0 +1,62 @@
+"""
+model_engine: predict_emotion dispatch, the compiled RBF-SVM predictor and
+the result cache.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import model_engine  # noqa: E402
+from features import compute_relative_band_powers, extract_band_powers, \
+    extract_features_from_multichannel  # noqa: E402
+from preprocessing import preprocess_eeg  # noqa: E402
+
+FS = 128.0
+
+
+def _inputs(seed: int):
+    """(features, relative band powers) for a random 14-channel recording."""
+    raw = np.random.default_rng(seed).standard_normal((1280, 14)).astype(np.float32) * 20
+    signal = preprocess_eeg(raw, fs=FS)
+    features = extract_features_from_multichannel(signal, fs=FS)
+    band_powers = compute_relative_band_powers(extract_band_powers(signal.mean(axis=1), fs=FS))
+    return features, band_powers
+
+
+@pytest.mark.parametrize("model_type, model_used", [("SVM", "SVM"), ("AUTO", "ENSEMBLE")])
+def test_predict_emotion(model_type, model_used):
+    features, band_powers = _inputs(0)
+    result = model_engine.predict_emotion(features, band_powers, model_type=model_type)
+
+    assert result["modelUsed"] == model_used
+    assert result["emotion"] in model_engine.EMOTIONS_ORDER
+    assert set(result["emotionScores"]) == set(model_engine.EMOTIONS_ORDER)
+    assert result["emotionScores"][result["emotion"]] == max(result["emotionScores"].values())
+    assert 0.0 <= result["confidence"] <= 1.0
+    assert result["interpretation"]
+
+
+@pytest.mark.skipif(model_engine._SVM_COMPILED is None, reason="no compiled RBF SVM")
+def test_compiled_svm_matches_predict_proba():
+    for seed in range(10):
+        features, _ = _inputs(seed)
+        compiled = model_engine._rbf_svm_proba(model_engine._SVM_COMPILED, features)
+        expected = model_engine._SVM_MODEL.predict_proba(features.reshape(1, -1))[0]
+        np.testing.assert_allclose(compiled, expected, atol=1e-5)
+
+
+def test_result_cache_returns_independent_scores():
+    features, band_powers = _inputs(1)
+    first = model_engine.predict_emotion(features, band_powers, model_type="SVM")
+    first["emotionScores"][first["emotion"]] = -1.0
+    first["extra"] = True
+
+    second = model_engine.predict_emotion(features, band_powers, model_type="SVM")
+    assert second["emotionScores"] is not first["emotionScores"]
+    assert second["emotionScores"][second["emotion"]] != -1.0
+    assert "extra" not in second